@@ -1,11 +1,20 @@
 """This module offers a read and write function to get
 2-dimensional lists in and out of Excel files.
 """
+import os
 import re
+import zipfile
+import warnings
+import functools
 import itertools
 import datetime as dt
+from xml.etree import ElementTree
 
 # Optional dependencies
+try:
+    import numpy as np
+except ImportError:
+    np = None
 try:
     import openpyxl
 except ImportError:
@@ -14,6 +23,10 @@ try:
     import pyxlsb
 except ImportError:
     pyxlsb = None
+try:
+    import python_calamine
+except ImportError:
+    python_calamine = None
 try:
     import xlrd
     from xlrd.biffh import error_text_from_code
@@ -28,14 +41,103 @@ try:
 except ImportError:
     xlsxwriter = None
 
+# A1 notation, e.g., "A1" or "$A$1"
+_A1_RE = re.compile(r"(\$?)([A-Z]{1,3})(\$?)(\d+)")
+
+# pyxlsb returns errors as hex codes
+_XLSB_ERRORS = {"0x0": "#NULL!", "0x7": "#DIV/0!", "0xf": "#VALUE!",
+                "0x17": "#REF!", "0x1d": "#NAME?", "0x24": "#NUM!",
+                "0x2a": "#N/A"}
+
+# Regular openpyxl worksheets with more cells than this make read warn
+READ_ONLY_THRESHOLD = 10_000
+
+
+class PerformanceWarning(UserWarning):
+    """Warning about code that runs slower than it needs to"""
+
+
+def open_workbook(filename):
+    """Open an Excel file with openpyxl in read-only mode.
+
+    Workbooks opened like this are much faster to load and use much
+    less memory than regular workbooks, so you should use them with read.
+
+    Parameters
+    ----------
+    filename : str or path-like
+        Path to the xlsx/xlsm file
+
+    Returns
+    -------
+    openpyxl.Workbook
+        A read-only workbook: call its close method when you are done
+    """
+    return openpyxl.load_workbook(filename, read_only=True, data_only=True,
+                                  keep_links=False)
+
+
+def sheet_names(filename):
+    """Return the sheet names of an xlsx/xlsm file.
+
+    Only reads xl/workbook.xml from the zip archive instead of loading the
+    whole workbook, which would also parse the styles and shared strings.
+
+    Parameters
+    ----------
+    filename : str or path-like
+        Path to the xlsx/xlsm file
+
+    Returns
+    -------
+    list
+        The names of all sheets in the workbook's order
+    """
+    with zipfile.ZipFile(filename) as archive:
+        root = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    # Compare the tag without namespace as it depends on the OOXML flavor
+    return [element.get("name") for element in root.iter()
+            if element.tag.rpartition("}")[2] == "sheet"]
+
+
+def open_xlsb(filename, sheet):
+    """Open a sheet of an xlsb file with python-calamine.
+
+    Reading these sheets is much faster than reading pyxlsb sheets
+    as calamine parses the file in native code.
 
-def read(sheet, first_cell="A1", last_cell=None):
+    Parameters
+    ----------
+    filename : str or path-like
+        Path to the xlsb file
+    sheet : str or int
+        Name or zero-based index of the sheet
+
+    Returns
+    -------
+    python_calamine.CalamineSheet
+        A sheet that can be used with read
+    """
+    if python_calamine is None:
+        raise ImportError("open_xlsb requires python-calamine: install it "
+                          "via 'pip install python-calamine'")
+    book = python_calamine.CalamineWorkbook.from_path(os.fspath(filename))
+    if isinstance(sheet, int):
+        return book.get_sheet_by_index(sheet)
+    return book.get_sheet_by_name(sheet)
+
+
+def read(sheet, first_cell="A1", last_cell=None, as_tuples=False,
+         as_array=False):
     """Read a 2-dimensional list from an Excel range.
 
     Parameters
     ----------
     sheet : object
-        An xlrd, openpyxl or pyxlsb sheet object
+        An xlrd, openpyxl, pyxlsb or python-calamine sheet object.
+        openpyxl sheets should come from a workbook opened via
+        open_workbook (read-only mode), python-calamine sheets from
+        open_xlsb.
     first_cell : str or tuple, optional
         Top-left corner of the Excel range you want to read.
         Can be a string like "A1" or a row/col tuple like (1, 1),
@@ -44,12 +146,24 @@ def read(sheet, first_cell="A1", last_cell=None):
         Bottom-right corner of the Excel range you want to read.
         Can be a string like "A1" or a row/col tuple like (1, 1),
         default is the bottom-right cell of the used range.
+    as_tuples : bool, optional
+        If True, returns the rows as tuples instead of lists. With openpyxl
+        sheets, this saves a copy of every row. Default is False.
+    as_array : bool, optional
+        If True, returns a 2-dimensional NumPy array instead of a list.
+        The array has dtype float64 if an xlrd range only contains numbers,
+        otherwise dtype object. Requires NumPy, default is False.
 
     Returns
     -------
-    list
-        A 2-dimensional list with the values of the Excel range
+    list or numpy.ndarray
+        A 2-dimensional list (or array) with the values of the Excel range
     """
+    if as_tuples and as_array:
+        raise ValueError("as_tuples and as_array can't both be True")
+    if as_array and np is None:
+        raise ImportError("as_array=True requires NumPy: install it "
+                          "via 'pip install numpy'")
     # xlrd
     if xlrd and isinstance(sheet, xlrd.sheet.Sheet):
         # isinstance returns True if sheet is of type xlrd.sheet.Sheet
@@ -63,25 +177,53 @@ def read(sheet, first_cell="A1", last_cell=None):
         if not isinstance(last_cell, tuple):
             last_cell = xl_cell_to_rowcol(last_cell)
             last_cell = (last_cell[0] + 1, last_cell[1] + 1)
-        values = []
-        for r in range(first_cell[0] - 1, last_cell[0]):
+        # Bind constants and functions to local names to avoid repeated
+        # attribute lookups in the loop below
+        XL_CELL_DATE = xlrd.XL_CELL_DATE
+        XL_CELL_ERROR = xlrd.XL_CELL_ERROR
+        XL_CELL_BOOLEAN = xlrd.XL_CELL_BOOLEAN
+        XL_CELL_EMPTY_OR_BLANK = (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK)
+        datemode = sheet.book.datemode
+        xldate_as_datetime = xlrd.xldate.xldate_as_datetime
+        rows = range(first_cell[0] - 1, last_cell[0])
+        if as_array:
+            first_col, last_col = first_cell[1] - 1, last_cell[1]
+            shape = (len(rows), last_col - first_col)
+            if all(set(sheet.row_types(r, first_col, last_col))
+                   <= {xlrd.XL_CELL_NUMBER} for r in rows):
+                # Numbers only: copy the rows straight into a float array
+                values = np.empty(shape, dtype=np.float64)
+                for i, r in enumerate(rows):
+                    values[i] = sheet.row_values(r, first_col, last_col)
+                return values
+            values = np.empty(shape, dtype=object)
+        else:
+            values = []
+        for i, r in enumerate(rows):
+            # Fetch the types and values of a whole row at once instead
+            # of instantiating a Cell object for each cell
+            types = sheet.row_types(r)
+            vals = sheet.row_values(r)
             row = []
             for c in range(first_cell[1] - 1, last_cell[1]):
                 # Handle the different cell types
-                if sheet.cell(r, c).ctype == xlrd.XL_CELL_DATE:
-                    value = xlrd.xldate.xldate_as_datetime(
-                        sheet.cell(r, c).value, sheet.book.datemode)
-                elif sheet.cell(r, c).ctype in [xlrd.XL_CELL_EMPTY,
-                                                xlrd.XL_CELL_BLANK]:
+                ctype = types[c]
+                v = vals[c]
+                if ctype == XL_CELL_DATE:
+                    value = xldate_as_datetime(v, datemode)
+                elif ctype in XL_CELL_EMPTY_OR_BLANK:
                     value = None
-                elif sheet.cell(r, c).ctype == xlrd.XL_CELL_ERROR:
-                    value = error_text_from_code[sheet.cell(r, c).value]
-                elif sheet.cell(r, c).ctype == xlrd.XL_CELL_BOOLEAN:
-                    value = bool(sheet.cell(r, c).value)
+                elif ctype == XL_CELL_ERROR:
+                    value = error_text_from_code[v]
+                elif ctype == XL_CELL_BOOLEAN:
+                    value = bool(v)
                 else:
-                    value = sheet.cell(r, c).value
+                    value = v
                 row.append(value)
-            values.append(row)
+            if as_array:
+                values[i] = row
+            else:
+                values.append(tuple(row) if as_tuples else row)
         return values
 
     # OpenPyXL
@@ -89,6 +231,17 @@ def read(sheet, first_cell="A1", last_cell=None):
             sheet,
             (openpyxl.worksheet.worksheet.Worksheet,
              openpyxl.worksheet._read_only.ReadOnlyWorksheet)):
+        if (not isinstance(sheet,
+                           openpyxl.worksheet._read_only.ReadOnlyWorksheet)
+                and sheet.max_row * sheet.max_column > READ_ONLY_THRESHOLD):
+            warnings.warn("Reading a big sheet from a regular openpyxl "
+                          "workbook: use open_workbook to load it in "
+                          "read-only mode instead.",
+                          PerformanceWarning, stacklevel=2)
+        if not openpyxl.LXML:
+            warnings.warn("openpyxl is using the slow xml.etree parser: "
+                          "install lxml for faster reading.",
+                          PerformanceWarning, stacklevel=2)
         if last_cell is None:
             # used range
             last_cell = (sheet.max_row, sheet.max_column)
@@ -96,18 +249,62 @@ def read(sheet, first_cell="A1", last_cell=None):
             first_cell = openpyxl.utils.cell.coordinate_to_tuple(first_cell)
         if not isinstance(last_cell, tuple):
             last_cell = openpyxl.utils.cell.coordinate_to_tuple(last_cell)
-        data = []
-        for row in sheet.iter_rows(min_row=first_cell[0], min_col=first_cell[1],
-                                   max_row=last_cell[0], max_col=last_cell[1],
-                                   values_only=True):
-            data.append(list(row))
+        rows = sheet.iter_rows(min_row=first_cell[0], min_col=first_cell[1],
+                               max_row=last_cell[0], max_col=last_cell[1],
+                               values_only=True)
+        if last_cell[0] is None or last_cell[1] is None:
+            # Read-only sheets without dimension in their XML (e.g., written
+            # in openpyxl's write_only mode) don't know their size, so
+            # iter_rows streams to the end and nothing can be preallocated
+            if as_array:
+                return _to_array(list(rows))
+            if as_tuples:
+                # iter_rows already returns tuples
+                return list(rows)
+            return [list(row) for row in rows]
+        # Preallocate the list (or array) as the number of rows is known
+        n_rows = last_cell[0] - first_cell[0] + 1
+        n = 0
+        if as_array:
+            data = np.empty((n_rows, last_cell[1] - first_cell[1] + 1),
+                            dtype=object)
+            for n, row in enumerate(rows, 1):
+                data[n - 1] = row
+            return data[:n]
+        data = [None] * n_rows
+        if as_tuples:
+            # iter_rows already returns tuples
+            for n, row in enumerate(rows, 1):
+                data[n - 1] = row
+        else:
+            for n, row in enumerate(rows, 1):
+                data[n - 1] = list(row)
+        # Read-only sheets don't return empty rows beyond the last row
+        # with data, so drop the unused slots
+        del data[n:]
         return data
 
+    # python-calamine
+    elif python_calamine and isinstance(sheet, python_calamine.CalamineSheet):
+        if not isinstance(first_cell, tuple):
+            first_cell = xl_cell_to_rowcol(first_cell)
+            first_cell = (first_cell[0] + 1, first_cell[1] + 1)
+        if last_cell and not isinstance(last_cell, tuple):
+            last_cell = xl_cell_to_rowcol(last_cell)
+            last_cell = (last_cell[0] + 1, last_cell[1] + 1)
+        # skip_empty_area=False makes the values start at A1
+        values = sheet.to_python(skip_empty_area=False)
+        rows = slice(first_cell[0] - 1, last_cell[0] if last_cell else None)
+        cols = slice(first_cell[1] - 1, last_cell[1] if last_cell else None)
+        data = []
+        for row in values[rows]:
+            # calamine returns empty cells as empty strings
+            row = [None if v == "" else v for v in row[cols]]
+            data.append(tuple(row) if as_tuples else row)
+        return _to_array(data) if as_array else data
+
     # pyxlsb
     elif pyxlsb and isinstance(sheet, pyxlsb.worksheet.Worksheet):
-        errors = {"0x0": "#NULL!", "0x7": "#DIV/0!", "0xf": "#VALUE!",
-                  "0x17": "#REF!", "0x1d": "#NAME?", "0x24": "#NUM!",
-                  "0x2a": "#N/A"}
         if not isinstance(first_cell, tuple):
             first_cell = xl_cell_to_rowcol(first_cell)
             first_cell = (first_cell[0] + 1, first_cell[1] + 1)
@@ -119,21 +316,36 @@ def read(sheet, first_cell="A1", last_cell=None):
         for row in itertools.islice(sheet.rows(),
                                     first_cell[0] - 1,
                                     last_cell[0] if last_cell else None):
-            data.append([errors.get(cell.v, cell.v) for cell in row]
-                        [first_cell[1] - 1 : last_cell[1] if last_cell else None])
-        return data
+            # Only strings can be error codes, so skip the lookup otherwise
+            row = ([_XLSB_ERRORS.get(cell.v, cell.v)
+                    if cell.v.__class__ is str else cell.v for cell in row]
+                   [first_cell[1] - 1 : last_cell[1] if last_cell else None])
+            data.append(tuple(row) if as_tuples else row)
+        return _to_array(data) if as_array else data
     else:
         raise TypeError(f"Couldn't handle sheet of type {type(sheet)}")
 
 
+def _to_array(rows):
+    """Turn a 2-dimensional list into a NumPy array of dtype object"""
+    # With rows of different lengths, np.array(rows, dtype=object) would
+    # return a 1-dimensional array of lists, so fill an array instead
+    values = np.empty((len(rows), max(map(len, rows), default=0)),
+                      dtype=object)
+    for i, row in enumerate(rows):
+        values[i, :len(row)] = row
+    return values
+
+
 def write(sheet, values, first_cell="A1", date_format=None):
     """Write a 2-dimensional list to an Excel range.
 
     Parameters
     ----------
     sheet : object
-        An openpyxl, xlsxwriter or xlwt sheet object. openpyxl's 
-        write_only=True mode is not supported.
+        An openpyxl, xlsxwriter or xlwt sheet object. With openpyxl's
+        write_only=True mode, rows can only be appended, so the sheet
+        mustn't contain any rows yet.
     values : list
         A 2-dimensional list of values
     first_cell : str or tuple, optional
@@ -153,14 +365,46 @@ def write(sheet, values, first_cell="A1", date_format=None):
                 date_format = "mm/dd/yy"
         if not isinstance(first_cell, tuple):
             first_cell = openpyxl.utils.coordinate_to_tuple(first_cell)
-        for i, row in enumerate(values):
-            for j, value in enumerate(row):
-                cell = sheet.cell(row=first_cell[0] + i,
-                                  column=first_cell[1] + j)
-                cell.value = value
+        # sheet.cell used to reject these, but the cell dictionary doesn't
+        if first_cell[0] < 1 or first_cell[1] < 1:
+            raise ValueError("Row or column values must be at least 1")
+        # Access the cell dictionary directly instead of going through
+        # sheet.cell for every value, but keep existing cells (and
+        # with them their formatting)
+        cells = sheet._cells
+        Cell = openpyxl.cell.cell.Cell
+        for i, row in enumerate(values, first_cell[0]):
+            for j, value in enumerate(row, first_cell[1]):
+                cell = cells.get((i, j))
+                if cell is None:
+                    cell = cells[(i, j)] = Cell(sheet, row=i, column=j,
+                                                value=value)
+                else:
+                    cell.value = value
                 if date_format and isinstance(value, (dt.datetime, dt.date)):
                     cell.number_format = date_format
 
+    # OpenPyXL (write_only=True)
+    elif openpyxl and isinstance(
+            sheet, openpyxl.worksheet._write_only.WriteOnlyWorksheet):
+        if date_format is None:
+            date_format = "mm/dd/yy"
+        if not isinstance(first_cell, tuple):
+            first_cell = openpyxl.utils.coordinate_to_tuple(first_cell)
+        # Rows can only be appended, so pad them with empty rows
+        # and columns to get to first_cell
+        for _ in range(first_cell[0] - 1):
+            sheet.append([])
+        padding = [None] * (first_cell[1] - 1)
+        for row in values:
+            row = padding + list(row)
+            for j, value in enumerate(row):
+                # Only dates need a cell object to apply the number format
+                if isinstance(value, (dt.datetime, dt.date)):
+                    row[j] = openpyxl.cell.WriteOnlyCell(sheet, value=value)
+                    row[j].number_format = date_format
+            sheet.append(row)
+
     # XlsxWriter
     elif xlsxwriter and isinstance(sheet, xlsxwriter.worksheet.Worksheet):
         if date_format is not None:
@@ -181,18 +425,22 @@ def write(sheet, values, first_cell="A1", date_format=None):
             first_cell = (first_cell[0] - 1, first_cell[1] - 1)
         else:
             first_cell = xl_cell_to_rowcol(first_cell)
-        for i, row in enumerate(values):
-            for j, cell in enumerate(row):
-                if isinstance(cell, (dt.datetime, dt.date)):
-                    sheet.write(i + first_cell[0], j + first_cell[1],
-                                cell, date_format)
+        # xlwt has no write_row, so keep the per-cell work to a minimum
+        # by binding everything to local names outside of the loop
+        write_cell = sheet.write
+        date_types = (dt.datetime, dt.date)
+        first_col = first_cell[1]
+        for i, row in enumerate(values, first_cell[0]):
+            for j, cell in enumerate(row, first_col):
+                if isinstance(cell, date_types):
+                    write_cell(i, j, cell, date_format)
                 else:
-                    sheet.write(i + first_cell[0], j + first_cell[1],
-                                cell)
+                    write_cell(i, j, cell)
     else:
         raise TypeError(f"Couldn't handle sheet of type {type(sheet)}")
 
 
+@functools.lru_cache(maxsize=1024)
 def xl_cell_to_rowcol(cell_str):
     """
     Convert a cell reference in A1 notation to a zero indexed row and column.
@@ -235,16 +483,14 @@ def xl_cell_to_rowcol(cell_str):
     if not cell_str:
         return 0, 0
 
-    match = re.compile(r"(\$?)([A-Z]{1,3})(\$?)(\d+)").match(cell_str)
+    match = _A1_RE.match(cell_str)
     col_str = match.group(2)
     row_str = match.group(4)
 
     # Convert base26 column string to number.
-    expn = 0
     col = 0
-    for char in reversed(col_str):
-        col += (ord(char) - ord("A") + 1) * (26 ** expn)
-        expn += 1
+    for char in col_str:
+        col = col * 26 + (ord(char) - 64)  # ord("A") - 1 == 64
 
     # Convert 1-index to zero-index
     row = int(row_str) - 1
@@ -12,11 +12,19 @@ import pandas as pd
 
 # Have SQLAlchemy enforce foreign keys with SQLite, see:
 # https://docs.sqlalchemy.org/en/latest/dialects/sqlite.html#foreign-key-support
+# The other pragmas speed up writes: WAL (write-ahead logging) doesn't
+# block readers while writing and with synchronous=NORMAL, SQLite doesn't
+# wait for the disk on every commit. Note that WAL mode creates the
+# packagetracker.db-wal and packagetracker.db-shm files next to the database.
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     if isinstance(dbapi_connection, SQLite3Connection):
         cursor = dbapi_connection.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
         cursor.close()
 
 
@@ -64,9 +72,34 @@ def get_versions(package_name):
 
 
 def store_versions(df):
-    """Insert the records of the provided DataFrame df into the package_versions table"""
+    """Insert the records of the provided DataFrame df into the package_versions table.
+    Existing versions are updated instead of inserted a second time.
+    """
 
-    df.to_sql("package_versions", con=engine, if_exists="append", index=False)
+    # The UPSERT ("INSERT ... ON CONFLICT") only writes the rows that are new
+    # or changed (the WHERE clause skips unchanged versions) and needs
+    # SQLite >= 3.24. The timestamps are formatted like SQLAlchemy stores
+    # them and package_id is converted from NumPy to Python integers as
+    # SQLite can't handle NumPy/pandas types.
+    sql = """
+    INSERT INTO package_versions (package_id, version_string, uploaded_at)
+    VALUES (:package_id, :version_string, :uploaded_at)
+    ON CONFLICT (package_id, version_string)
+    DO UPDATE SET uploaded_at=excluded.uploaded_at
+    WHERE package_versions.uploaded_at <> excluded.uploaded_at
+    """
+    records = df.assign(
+        uploaded_at=df["uploaded_at"].dt.strftime("%Y-%m-%d %H:%M:%S.%f"),
+        package_id=df["package_id"].astype(object)).to_dict(orient="records")
+    with engine.begin() as con:
+        con.execute(text(sql), records)
+
+
+def analyze():
+    """Update the table statistics that SQLite uses to pick the best index"""
+
+    with engine.connect() as con:
+        con.execute("ANALYZE")
 
 
 def delete_versions():
@@ -99,7 +132,16 @@ def create_db():
     )
     """
 
-    sql_statements = [sql_table_packages, sql_table_versions]
+    # Covering index for get_versions: it contains all columns of the query,
+    # so SQLite can answer it without reading the table itself. packages
+    # doesn't need an extra index as UNIQUE(package_name) already creates one.
+    sql_index_versions = """
+    CREATE INDEX IF NOT EXISTS idx_package_versions_package_id
+    ON package_versions (package_id, uploaded_at, version_string)
+    """
+
+    sql_statements = [sql_table_packages, sql_table_versions,
+                      sql_index_versions]
     with engine.connect() as con:
         for sql in sql_statements:
             con.execute(sql)
@@ -3,9 +3,14 @@ or manipulate Excel.
 """
 
 import datetime as dt
+from pathlib import Path
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 from dateutil import tz
 import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import matplotlib.pyplot as plt
 import xlwings as xw
@@ -16,6 +21,34 @@ import database
 # This is the part of the URL that is the same for every request
 BASE_URL = "https://pypi.org/pypi"
 
+# Number of packages that are downloaded in parallel
+MAX_WORKERS = 8
+
+# HTTP session that caches the PyPI responses in pypi_cache.sqlite next to
+# this file. With cache_control=True, it revalidates expired responses via
+# their ETag so that PyPI only sends the data again if it has changed.
+# The requests run in parallel threads that share the session's connections.
+this_dir = Path(__file__).resolve().parent
+session = requests_cache.CachedSession(str(this_dir / "pypi_cache"),
+                                       backend="sqlite", expire_after=3600,
+                                       cache_control=True)
+session.mount("https://", HTTPAdapter(pool_connections=MAX_WORKERS,
+                                      pool_maxsize=MAX_WORKERS))
+
+
+def _fetch_releases(session, package_name):
+    """ Downloads the JSON data of package_name from PyPI,
+    returns None if the request fails.
+    """
+    try:
+        ret = session.get(f"{BASE_URL}/{package_name}/json", timeout=6)
+    except requests.exceptions.RequestException:
+        # e.g., a timeout: don't abort the downloads of the other packages
+        return None
+    if ret.status_code == 200:
+        return ret.json()  # parse the JSON string into a dictionary
+    return None
+
 
 def add_package():
     """ Adds a new package including the version history to the database.
@@ -33,8 +66,8 @@ def add_package():
     if not package_name:
         feedback_cell.value = "Error: Please provide a name!"
         return
-    if requests.get(f"{BASE_URL}/{package_name}/json",
-                    timeout=6).status_code != 200:
+    if session.get(f"{BASE_URL}/{package_name}/json",
+                   timeout=6).status_code != 200:
         feedback_cell.value = "Error: Package not found!"
         return
 
@@ -53,8 +86,8 @@ def add_package():
 
 
 def update_database():
-    """ Deletes all records from the versions table, fetches all
-    data again from PyPI and stores the versions again in the table.
+    """ Fetches all data again from PyPI and stores the new or
+    changed versions in the versions table.
     """
     # Excel objects
     sheet_db = xw.Book.caller().sheets["Database"]
@@ -62,34 +95,38 @@ def update_database():
     # Clear logs
     sheet_db["log"].expand().clear_contents()
 
-    # Keeping things super simple: Delete all versions for all packages
-    # and repopulate the package_versions table from scratch
-    database.delete_versions()
     df_packages = database.get_packages()
     logs = []
 
     # Query the PyPI REST API
-    for package_id, row in df_packages.iterrows():
-        ret = requests.get(f"{BASE_URL}/{row['package_name']}/json",
-                           timeout=6)
-        if ret.status_code == 200:
-            ret = ret.json()  # parse the JSON string into a dictionary
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        responses = list(executor.map(partial(_fetch_releases, session),
+                                      df_packages["package_name"]))
+
+    releases = []
+    for (package_id, row), ret in zip(df_packages.iterrows(), responses):
+        if ret is not None:
             logs.append(f"INFO: {row['package_name']} downloaded successfully")
         else:
             logs.append(f"ERROR: Could not download data for {row['package_name']}")
             continue
 
-        # Instantiate a DataFrame by extracting data from the REST API response
-        releases = []
+        # Extract the releases from the REST API response
         for version, files in ret["releases"].items():
-            if ret["releases"][version]:  # ignore releases without info
+            if files:  # ignore releases without info
                 releases.append((files[0]["upload_time"], version, package_id))
+
+    # Store the versions of all packages in a single transaction. Building
+    # a single DataFrame for all packages allows pandas to parse all
+    # timestamps in one vectorized call.
+    if releases:
         df_releases = pd.DataFrame(columns=["uploaded_at", "version_string", "package_id"],
                                    data=releases)
         df_releases["uploaded_at"] = pd.to_datetime(df_releases["uploaded_at"])
         df_releases = df_releases.sort_values("uploaded_at")
         database.store_versions(df_releases)
-        logs.append(f"INFO: {row['package_name']} stored to database successfully")
+        database.analyze()
+        logs.append("INFO: Stored all versions to database successfully")
 
     # Write out the last updated timestamp and logs
     sheet_db["updated_at"].value = (f"Last updated: "
@@ -133,12 +170,15 @@ def show_history():
         feedback_cell.value = f"Error: Didn't find any releases for {package_name}"
         return
 
-    # Calculate the number of releases per year and plot it
-    df_releases_yearly = df_releases.resample("Y").count()
-    df_releases_yearly.index = df_releases_yearly.index.year
-    df_releases_yearly.index.name = "Years"
-    df_releases_yearly = df_releases_yearly.rename(
-        columns={"version_string": "Number of Releases"})
+    # Calculate the number of releases per year and plot it. Grouping by
+    # year skips the datetime machinery of resample, reindex adds the
+    # years without releases so they show up as 0 like with resample.
+    years = df_releases.index.year
+    releases_yearly = df_releases.groupby(years).size().reindex(
+        range(years.min(), years.max() + 1), fill_value=0)
+    releases_yearly.index.name = "Years"
+    df_releases_yearly = releases_yearly.rename(
+        "Number of Releases").to_frame()
     ax = df_releases_yearly.plot.bar(
         title=f"Number of Releases per Year "
               f"({tracker_sheet['package_selection'].value})")
@@ -1,27 +1,84 @@
+import os
+import sys
 import multiprocessing
 from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import pandas as pd
-import openpyxl
+import excel
+
+# Optional dependency: python-calamine is a much faster reader than
+# openpyxl, but pandas only supports it as engine from version 2.2
+try:
+    import python_calamine
+except ImportError:
+    python_calamine = None
+if python_calamine and tuple(
+        int(i) for i in pd.__version__.split(".")[:2]) < (2, 2):
+    python_calamine = None
+
+ENGINE = "calamine" if python_calamine else "openpyxl"
+
+# With fork, the workers start as copies of this process and don't have
+# to import pandas again. It's only safe to use on Linux: on macOS, it
+# can crash the workers and Windows only supports spawn.
+if sys.platform.startswith("linux"):
+    _MP_CONTEXT = multiprocessing.get_context("fork")
+else:
+    _MP_CONTEXT = multiprocessing.get_context()
+
+# The process pool is created on first use and then reused by all calls
+# so that only the first call pays for starting the worker processes
+_POOL = None
+_POOL_MAX_WORKERS = None
+
+
+def _get_pool(max_workers=None):
+    global _POOL, _POOL_MAX_WORKERS
+    # A pool whose worker died (e.g., killed for running out of memory) is
+    # marked as broken and refuses new tasks, so it has to be replaced
+    if (_POOL is None or _POOL._broken
+            or max_workers != _POOL_MAX_WORKERS):
+        if _POOL is not None:
+            _POOL.shutdown()
+        # By default, the pool spawns as many processes as there are CPU cores
+        _POOL = ProcessPoolExecutor(max_workers=max_workers,
+                                    mp_context=_MP_CONTEXT)
+        _POOL_MAX_WORKERS = max_workers
+    return _POOL
 
 
 def _read_sheet(filename, sheet_name):
     # The leading underscore in the function name is used by convention
     # to mark it as "private", i.e. it shouldn't be used directly outside
-    # of this module.
-    df = pd.read_excel(filename, sheet_name=sheet_name, engine='openpyxl')
+    # of this module. pandas' openpyxl engine already opens the file in
+    # read-only mode (read_only=True, data_only=True).
+    df = pd.read_excel(filename, sheet_name=sheet_name, engine=ENGINE)
     return sheet_name, df
 
-def read_excel(filename, sheet_name=None):
-    if sheet_name is None:
-        book = openpyxl.load_workbook(filename,
-                                      read_only=True, data_only=True)
-        sheet_name = book.sheetnames
-        book.close()
-    with multiprocessing.Pool() as pool:
-        # By default, Pool spawns as many processes as there are CPU cores.
-        # starmap maps a tuple of arguments to a function. The zip expression
-        # produces a list with tuples of the following form:
-        # [('filename.xlsx', 'Sheet1'), ('filename.xlsx', 'Sheet2)]
-        data = pool.starmap(_read_sheet, zip(repeat(filename), sheet_name))
+def read_excel(filename, sheet_name=None, max_workers=None, parallel=True):
+    if parallel and sheet_name is None:
+        sheet_name = excel.sheet_names(filename)
+    if not parallel or len(sheet_name) <= 2:
+        # Open the file only once and read all sheets from it. This
+        # is faster for workbooks with few or small sheets as it
+        # doesn't have to start any workers.
+        with pd.ExcelFile(filename, engine=ENGINE) as xls:
+            return pd.read_excel(xls, sheet_name=sheet_name)
+    if ENGINE == "calamine":
+        # calamine parses the file in Rust without holding the GIL, so
+        # threads are enough and the DataFrames don't have to be pickled
+        # to get them back from the worker processes. openpyxl is pure
+        # Python and holds the GIL, so it needs processes.
+        max_workers = max_workers or min(8, os.cpu_count())
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            data = list(pool.map(_read_sheet, repeat(filename), sheet_name))
+    else:
+        pool = _get_pool(max_workers)
+        # Every task returns a whole DataFrame, so unlike the other
+        # parallel_* modules, this sends only one sheet per task (chunksize=1)
+        # map calls _read_sheet with one element of each iterable at a time:
+        # _read_sheet('filename.xlsx', 'Sheet1'),
+        # _read_sheet('filename.xlsx', 'Sheet2')
+        data = pool.map(_read_sheet, repeat(filename), sheet_name)
     return {i[0]: i[1] for i in data}
@@ -1,27 +1,66 @@
-import multiprocessing
+import os
 from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 
 import xlrd
 import excel
 
 
-def _read_sheet(filename, sheetname):
+# The process pool is created on first use and then reused by all calls
+# so that only the first call pays for starting the worker processes
+_POOL = None
+_POOL_MAX_WORKERS = None
+
+
+def _get_pool(max_workers=None):
+    global _POOL, _POOL_MAX_WORKERS
+    # A pool whose worker died (e.g., killed for running out of memory) is
+    # marked as broken and refuses new tasks, so it has to be replaced
+    if (_POOL is None or _POOL._broken
+            or max_workers != _POOL_MAX_WORKERS):
+        if _POOL is not None:
+            _POOL.shutdown()
+        # By default, the pool spawns as many processes as there are CPU cores
+        _POOL = ProcessPoolExecutor(max_workers=max_workers)
+        _POOL_MAX_WORKERS = max_workers
+    return _POOL
+
+
+def _read_sheets(filename, sheetnames):
     # The leading underscore in the function name is used by convention
     # to mark it as "private", i.e. it shouldn't be used directly outside
-    # of this module.
+    # of this module. Every task reads a whole batch of sheets so that
+    # the file is only opened once per batch. The book is closed before
+    # returning: the workers outlive the call and would otherwise keep the
+    # file open (and locked on Windows).
     with xlrd.open_workbook(filename, on_demand=True) as book:
-        sheet = book.sheet_by_name(sheetname)
-        data = excel.read(sheet)
-    return sheet.name, data
+        data = {}
+        for name in sheetnames:
+            data[name] = excel.read(book.sheet_by_name(name))
+            # With on_demand=True, the book keeps every loaded sheet in
+            # memory until it's unloaded explicitly. xlrd ignores on_demand
+            # for xlsx files, which can't load a sheet again once unloaded.
+            if book.on_demand:
+                book.unload_sheet(name)
+        return data
 
-def open_workbook(filename, sheetnames=None):
+def open_workbook(filename, sheetnames=None, max_workers=None):
     if sheetnames is None:
         with xlrd.open_workbook(filename, on_demand=True) as book:
             sheetnames = book.sheet_names()
-    with multiprocessing.Pool() as pool:
-        # By default, Pool spawns as many processes as there are CPU cores.
-        # starmap maps a tuple of arguments to a function. The zip expression
-        # produces a list with tuples of the following form:
-        # [('filename.xlsx', 'Sheet1'), ('filename.xlsx', 'Sheet2)]
-        data = pool.starmap(_read_sheet, zip(repeat(filename), sheetnames))
-    return {i[0]: i[1] for i in data}
+    if len(sheetnames) <= 2:
+        # With only one or two sheets, starting the worker processes and
+        # pickling the results costs more than it saves: read serially
+        return _read_sheets(filename, sheetnames)
+    pool = _get_pool(max_workers)
+    # Split the sheets into one batch per worker so that every worker
+    # opens the file only once
+    n_workers = min(max_workers or os.cpu_count(), len(sheetnames))
+    batches = [sheetnames[i::n_workers] for i in range(n_workers)]
+    # map calls _read_sheets with one element of each iterable at a time:
+    # _read_sheets('filename.xls', ['Sheet1', 'Sheet3']), ...
+    data = {}
+    for batch in pool.map(_read_sheets, repeat(filename), batches):
+        data.update(batch)
+    # Return the sheets in the requested order
+    return {name: data[name] for name in sheetnames}
@@ -1,7 +1,10 @@
+import os
 from pathlib import Path
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 
 import pandas as pd
-from openpyxl.styles import Font, Alignment
+from openpyxl.styles import Font, Alignment, NamedStyle
 from openpyxl.formatting.rule import CellIsRule
 from openpyxl.chart import BarChart, Reference
 from openpyxl.chart.shapes import GraphicalProperties
@@ -11,103 +14,135 @@ from openpyxl.drawing.line import LineProperties
 # Directory of this file
 this_dir = Path(__file__).resolve().parent
 
-# Read in all files
-parts = []
-for path in (this_dir / "sales_data").rglob("*.xls*"):
-    print(f'Reading {path.name}')
-    part = pd.read_excel(path)
-    parts.append(part)
-
-# Combine the DataFrames from each file into a single DataFrame
-df = pd.concat(parts)
-
-# Pivot each store into a column and sum up all transactions per date
-pivot = pd.pivot_table(df,
-                       index="transaction_date", columns="store",
-                       values="amount", aggfunc="sum")
-
-# Resample to end of month and assign an index name 
-summary = pivot.resample("M").sum()
-summary.index.name = "Month"
-
-# Sort columns by total revenue
-summary = summary.loc[:, summary.sum().sort_values().index]
-
-# Add row and column totals: Using "append" together with "rename"
-# is a convenient way to add a row to the bottom of a DataFrame
-summary.loc[:, "Total"] = summary.sum(axis=1)
-summary = summary.append(summary.sum(axis=0).rename("Total"))
-
-#### Write summary report to Excel file ####
-
-# DataFrame position and number of rows/columns
-# openpxyl uses 1-based indices
-startrow, startcol = 3, 2
-nrows, ncols = summary.shape
-
-with pd.ExcelWriter(this_dir / "sales_report_openpyxl.xlsx",
-                    engine="openpyxl", write_only=True) as writer:
-    # pandas uses 0-based indices
-    summary.to_excel(writer, sheet_name="Sheet1",
-                     startrow=startrow - 1, startcol=startcol - 1)
-
-    # Get openpyxl book and sheet object 
-    book = writer.book
-    sheet = writer.sheets["Sheet1"]
-
-    # Set title
-    sheet.cell(row=1, column=startcol, value="Sales Report")
-    sheet.cell(row=1, column=startcol).font = Font(size=24, bold=True)
-
-    # Sheet formatting
-    sheet.sheet_view.showGridLines = False
-
-    # Format the DataFrame with
-    # - number format
-    # - column width
-    # - conditional formatting
-    for row in range(startrow + 1, startrow + nrows + 1):
-        for col in range(startcol + 1, startcol + ncols + 1):
-            cell = sheet.cell(row=row, column=col)
-            cell.number_format = "#,##0"
-            cell.alignment = Alignment(horizontal="center")
-
-    for cell in sheet["B"]:
-        cell.number_format = "mmm yy"
-
-    for col in range(startcol, startcol + ncols + 1):
-        cell = sheet.cell(row=startrow, column=col)
-        sheet.column_dimensions[cell.column_letter].width = 14
-
-    first_cell = sheet.cell(row=startrow + 1, column=startcol + 1)
-    last_cell = sheet.cell(row=startrow + nrows, column=startcol + ncols)
-    range_address = f"{first_cell.coordinate}:{last_cell.coordinate}"
-    sheet.conditional_formatting.add(range_address,
-                                     CellIsRule(operator="lessThan",
-                                                formula=["20000"],
-                                                stopIfTrue=True,
-                                                font=Font(color="E93423")))
-
-    # Chart
-    chart = BarChart()
-    chart.type = "col"
-    chart.title = "Sales per Month and Store"
-    chart.height = 11.5
-    chart.width = 20.5
-
-    # Add each column as a series, ignoring total row and col
-    data = Reference(sheet, min_col=startcol + 1, min_row=startrow,
-                     max_row=startrow + nrows - 1,
-                     max_col=startcol + ncols - 1)
-    categories = Reference(sheet, min_col=startcol, min_row=startrow + 1,
-                           max_row=startrow + nrows - 1)
-    chart.add_data(data, titles_from_data=True)
-    chart.set_categories(categories)
-    cell = sheet.cell(row=startrow + nrows + 2, column=startcol)
-    sheet.add_chart(chart=chart, anchor=cell.coordinate)
-
-    # Chart formatting
-    chart.y_axis.title = "Sales"
-    chart.x_axis.title = summary.index.name
-    # Hide y-axis line: spPR stands for ShapeProperties 
-    chart.y_axis.spPr = GraphicalProperties(ln=LineProperties(noFill=True))
\ No newline at end of file
+# Use the much faster calamine engine if python-calamine is installed
+# (pip install python-calamine, requires pandas >= 2.2), otherwise
+# let pandas pick the engine based on the file extension
+try:
+    import python_calamine
+except ImportError:
+    python_calamine = None
+pandas_version = tuple(int(i) for i in pd.__version__.split(".")[:2])
+ENGINE = "calamine" if python_calamine and pandas_version >= (2, 2) else None
+
+# Font for the conditional formatting of values below target
+BELOW_TARGET_FONT = Font(color="E93423")
+
+# The guard is required for multiprocessing: on Windows and macOS, every
+# process imports this file and must not run the script again
+if __name__ == "__main__":
+    # Read in all files with a pool
+    # of worker processes that read the files in parallel
+    paths = list((this_dir / "sales_data").rglob("*.xls*"))
+    for path in paths:
+        print(f'Reading {path.name}')
+    read_excel = partial(pd.read_excel, engine=ENGINE)
+    with ProcessPoolExecutor() as executor:
+        # Send a few files per task to reduce the communication overhead
+        chunksize = max(1, len(paths) // (os.cpu_count() * 4))
+        parts = list(executor.map(read_excel, paths, chunksize=chunksize))
+
+    # Combine the DataFrames from each file into a single DataFrame
+    df = pd.concat(parts, copy=False, ignore_index=True)
+
+    # Sum up all transactions per month (end of month) and store, then
+    # pivot each store into a column. Grouping by month right away avoids
+    # building a pivot table with one row per day that is then resampled.
+    # asfreq adds months without transactions, as resample would do.
+    summary = (df.groupby(
+                   [pd.Grouper(key="transaction_date", freq="M"), "store"])
+               ["amount"].sum()
+               .unstack("store", fill_value=0)
+               .asfreq("M", fill_value=0))
+    summary.index.name = "Month"
+
+    # Sort columns by total revenue
+    summary = summary.loc[:, summary.sum().sort_values().index]
+
+    # Add row and column totals: Turning the column sums into a
+    # one-row DataFrame allows to add them to the bottom via concat
+    summary.loc[:, "Total"] = summary.sum(axis=1)
+    totals = summary.sum(axis=0).rename("Total").to_frame().T
+    totals.index.name = summary.index.name  # keep "Month" as index name
+    summary = pd.concat([summary, totals], copy=False)
+
+    #### Write summary report to Excel file ####
+
+    # DataFrame position and number of rows/columns
+    # openpxyl uses 1-based indices
+    startrow, startcol = 3, 2
+    nrows, ncols = summary.shape
+
+    with pd.ExcelWriter(this_dir / "sales_report_openpyxl.xlsx",
+                        engine="openpyxl", write_only=True) as writer:
+        # pandas uses 0-based indices
+        summary.to_excel(writer, sheet_name="Sheet1",
+                         startrow=startrow - 1, startcol=startcol - 1)
+
+        # Get openpyxl book and sheet object 
+        book = writer.book
+        sheet = writer.sheets["Sheet1"]
+
+        # Set title
+        sheet.cell(row=1, column=startcol, value="Sales Report")
+        sheet.cell(row=1, column=startcol).font = Font(size=24, bold=True)
+
+        # Sheet formatting
+        sheet.sheet_view.showGridLines = False
+
+        # Format the DataFrame with
+        # - number format
+        # - column width
+        # - conditional formatting
+        # Number format and alignment are registered once as named style.
+        # Styles set on column_dimensions wouldn't work: they only apply to
+        # new cells in Excel, not to the cells that to_excel already wrote.
+        number_style = NamedStyle(name="Sales", number_format="#,##0",
+                                  alignment=Alignment(horizontal="center"))
+        book.add_named_style(number_style)
+        for row in sheet.iter_rows(min_row=startrow + 1,
+                                   max_row=startrow + nrows,
+                                   min_col=startcol + 1,
+                                   max_col=startcol + ncols):
+            for cell in row:
+                cell.style = "Sales"
+
+        # Only format the month cells instead of the whole column B
+        for row in range(startrow + 1, startrow + nrows + 1):
+            sheet.cell(row=row, column=startcol).number_format = "mmm yy"
+
+        for col in range(startcol, startcol + ncols + 1):
+            cell = sheet.cell(row=startrow, column=col)
+            sheet.column_dimensions[cell.column_letter].width = 14
+
+        first_cell = sheet.cell(row=startrow + 1, column=startcol + 1)
+        last_cell = sheet.cell(row=startrow + nrows, column=startcol + ncols)
+        range_address = f"{first_cell.coordinate}:{last_cell.coordinate}"
+        sheet.conditional_formatting.add(range_address,
+                                         CellIsRule(operator="lessThan",
+                                                    formula=["20000"],
+                                                    stopIfTrue=True,
+                                                    font=BELOW_TARGET_FONT))
+
+        # Chart
+        chart = BarChart()
+        chart.type = "col"
+        chart.title = "Sales per Month and Store"
+        chart.height = 11.5
+        chart.width = 20.5
+
+        # Add each column as a series, ignoring total row and col
+        data = Reference(sheet, min_col=startcol + 1, min_row=startrow,
+                         max_row=startrow + nrows - 1,
+                         max_col=startcol + ncols - 1)
+        categories = Reference(sheet, min_col=startcol, min_row=startrow + 1,
+                               max_row=startrow + nrows - 1)
+        chart.add_data(data, titles_from_data=True)
+        chart.set_categories(categories)
+        cell = sheet.cell(row=startrow + nrows + 2, column=startcol)
+        sheet.add_chart(chart=chart, anchor=cell.coordinate)
+
+        # Chart formatting
+        chart.y_axis.title = "Sales"
+        chart.x_axis.title = summary.index.name
+        # Hide y-axis line: spPR stands for ShapeProperties 
+        chart.y_axis.spPr = GraphicalProperties(ln=LineProperties(noFill=True))
\ No newline at end of file
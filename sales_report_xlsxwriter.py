@@ -1,4 +1,7 @@
+import os
 from pathlib import Path
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 
 import pandas as pd
 
@@ -6,97 +9,127 @@ import pandas as pd
 # Directory of this file
 this_dir = Path(__file__).resolve().parent
 
-# Read in all files
-parts = []
-for path in (this_dir / "sales_data").rglob("*.xls*"):
-    print(f'Reading {path.name}')
-    part = pd.read_excel(path)
-    parts.append(part)
-
-# Combine the DataFrames from each file into a single DataFrame
-df = pd.concat(parts)
-
-# Pivot each store into a column and sum up all transactions per date
-pivot = pd.pivot_table(df,
-                       index="transaction_date", columns="store",
-                       values="amount", aggfunc="sum")
-
-# Resample to end of month and assign an index name 
-summary = pivot.resample("M").sum()
-summary.index.name = "Month"
-
-# Sort columns by total revenue
-summary = summary.loc[:, summary.sum().sort_values().index]
-
-# Add row and column totals: Using "append" together with "rename"
-# is a convenient way to add a row to the bottom of a DataFrame
-summary.loc[:, "Total"] = summary.sum(axis=1)
-summary = summary.append(summary.sum(axis=0).rename("Total"))
-
-#### Write summary report to Excel file ####
-
-# DataFrame position and number of rows/columns
-# xlsxwriter uses 0-based indices
-startrow, startcol = 2, 1
-nrows, ncols = summary.shape
-
-with pd.ExcelWriter(this_dir / "sales_report_xlsxwriter.xlsx",
-                    engine="xlsxwriter", datetime_format="mmm yy") as writer:
-    summary.to_excel(writer, sheet_name="Sheet1",
-                     startrow=startrow, startcol=startcol)
-
-    # Get xlsxwriter book and sheet object 
-    book = writer.book
-    sheet = writer.sheets["Sheet1"]
-
-    # Set title
-    title_format = book.add_format({"bold": True, "size": 24})
-    sheet.write(0, startcol, "Sales Report", title_format)
-
-    # Sheet formatting
-    # 2 = hide on screen and when printing
-    sheet.hide_gridlines(2)
-
-    # Format the DataFrame with
-    # - number format
-    # - column width
-    # - conditional formatting
-    number_format = book.add_format({"num_format": "#,##0",
-                                     "align": "center"})
-    below_target_format = book.add_format({"font_color": "#E93423"})
-    sheet.set_column(first_col=startcol, last_col=startcol + ncols,
-                     width=14, cell_format=number_format)
-    sheet.conditional_format(first_row=startrow + 1,
-                             first_col=startcol + 1,
-                             last_row=startrow + nrows,
-                             last_col=startcol + ncols,
-                             options={"type": "cell", "criteria": "<=",
-                                      "value": 20000,
-                                      "format": below_target_format})
-
-    # Chart
-    chart = book.add_chart({"type": "column"})
-    chart.set_title({"name": "Sales per Month and Store"})
-    chart.set_size({"width": 830, "height": 450})
-
-    # Add each column as a series, ignoring total row and col
-    for col in range(1, ncols):
-        chart.add_series({
-             # [sheetname, first_row, first_col, last_row, last_col]
-            "name": ["Sheet1", startrow, startcol + col],
-            "categories": ["Sheet1", startrow + 1, startcol,
-                           startrow + nrows - 1, startcol],
-            "values": ["Sheet1", startrow + 1, startcol + col,
-                       startrow + nrows - 1, startcol + col],
-        })
-
-    # Chart formatting
-    chart.set_x_axis({"name": summary.index.name,
-                      "major_tick_mark": "none"})
-    chart.set_y_axis({"name": "Sales",
-                      "line": {"none": True},
-                      "major_gridlines": {"visible": True},
-                      "major_tick_mark": "none"})
-
-    # Add the chart to the sheet
-    sheet.insert_chart(startrow + nrows + 2, startcol, chart)
\ No newline at end of file
+# Use the much faster calamine engine if python-calamine is installed
+# (pip install python-calamine, requires pandas >= 2.2), otherwise
+# let pandas pick the engine based on the file extension
+try:
+    import python_calamine
+except ImportError:
+    python_calamine = None
+pandas_version = tuple(int(i) for i in pd.__version__.split(".")[:2])
+ENGINE = "calamine" if python_calamine and pandas_version >= (2, 2) else None
+
+# The guard is required for multiprocessing: on Windows and macOS, every
+# process imports this file and must not run the script again
+if __name__ == "__main__":
+    # Read in all files with a pool
+    # of worker processes that read the files in parallel
+    paths = list((this_dir / "sales_data").rglob("*.xls*"))
+    for path in paths:
+        print(f'Reading {path.name}')
+    read_excel = partial(pd.read_excel, engine=ENGINE)
+    with ProcessPoolExecutor() as executor:
+        # Send a few files per task to reduce the communication overhead
+        chunksize = max(1, len(paths) // (os.cpu_count() * 4))
+        parts = list(executor.map(read_excel, paths, chunksize=chunksize))
+
+    # Combine the DataFrames from each file into a single DataFrame
+    df = pd.concat(parts, copy=False, ignore_index=True)
+
+    # Sum up all transactions per month (end of month) and store, then
+    # pivot each store into a column. Grouping by month right away avoids
+    # building a pivot table with one row per day that is then resampled.
+    # asfreq adds months without transactions, as resample would do.
+    summary = (df.groupby(
+                   [pd.Grouper(key="transaction_date", freq="M"), "store"])
+               ["amount"].sum()
+               .unstack("store", fill_value=0)
+               .asfreq("M", fill_value=0))
+    summary.index.name = "Month"
+
+    # Sort columns by total revenue
+    summary = summary.loc[:, summary.sum().sort_values().index]
+
+    # Add row and column totals: Turning the column sums into a
+    # one-row DataFrame allows to add them to the bottom via concat
+    summary.loc[:, "Total"] = summary.sum(axis=1)
+    totals = summary.sum(axis=0).rename("Total").to_frame().T
+    totals.index.name = summary.index.name  # keep "Month" as index name
+    summary = pd.concat([summary, totals], copy=False)
+
+    #### Write summary report to Excel file ####
+
+    # DataFrame position and number of rows/columns
+    # xlsxwriter uses 0-based indices
+    startrow, startcol = 2, 1
+    nrows, ncols = summary.shape
+
+    # Note: xlsxwriter's constant_memory mode can't be used here. It only
+    # keeps the current row in memory and requires the cells to be written
+    # row by row, but to_excel writes the DataFrame column by column and
+    # the title goes to the first row afterwards: constant_memory would
+    # silently drop those cells. The summary is small anyway.
+    with pd.ExcelWriter(this_dir / "sales_report_xlsxwriter.xlsx",
+                        engine="xlsxwriter",
+                        datetime_format="mmm yy") as writer:
+        summary.to_excel(writer, sheet_name="Sheet1",
+                         startrow=startrow, startcol=startcol)
+
+        # Get xlsxwriter book and sheet object 
+        book = writer.book
+        sheet = writer.sheets["Sheet1"]
+
+        # Set title
+        title_format = book.add_format({"bold": True, "size": 24})
+        sheet.write(0, startcol, "Sales Report", title_format)
+
+        # Sheet formatting
+        # 2 = hide on screen and when printing
+        sheet.hide_gridlines(2)
+
+        # Format the DataFrame with
+        # - number format
+        # - column width
+        # - conditional formatting
+        number_format = book.add_format({"num_format": "#,##0",
+                                         "align": "center"})
+        below_target_format = book.add_format({"font_color": "#E93423"})
+        sheet.set_column(first_col=startcol, last_col=startcol + ncols,
+                         width=14, cell_format=number_format)
+        sheet.conditional_format(first_row=startrow + 1,
+                                 first_col=startcol + 1,
+                                 last_row=startrow + nrows,
+                                 last_col=startcol + ncols,
+                                 options={"type": "cell", "criteria": "<=",
+                                          "value": 20000,
+                                          "format": below_target_format})
+
+        # Chart
+        chart = book.add_chart({"type": "column"})
+        chart.set_title({"name": "Sales per Month and Store"})
+        chart.set_size({"width": 830, "height": 450})
+
+        # Add each column as a series, ignoring total row and col.
+        # All series share the same categories (the months). The references
+        # have to be lists: xlsxwriter doesn't convert tuples into ranges.
+        # [sheetname, first_row, first_col, last_row, last_col]
+        categories = ["Sheet1", startrow + 1, startcol,
+                      startrow + nrows - 1, startcol]
+        for col in range(1, ncols):
+            chart.add_series({
+                "name": ["Sheet1", startrow, startcol + col],
+                "categories": categories,
+                "values": ["Sheet1", startrow + 1, startcol + col,
+                           startrow + nrows - 1, startcol + col],
+            })
+
+        # Chart formatting
+        chart.set_x_axis({"name": summary.index.name,
+                          "major_tick_mark": "none"})
+        chart.set_y_axis({"name": "Sales",
+                          "line": {"none": True},
+                          "major_gridlines": {"visible": True},
+                          "major_tick_mark": "none"})
+
+        # Add the chart to the sheet
+        sheet.insert_chart(startrow + nrows + 2, startcol, chart)
\ No newline at end of file
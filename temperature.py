@@ -1,11 +1,22 @@
 TEMPERATURE_SCALES = ("fahrenheit", "kelvin", "celsius")
 
 
+# Factor to convert a temperature difference from Fahrenheit to Celsius
+_F_SCALE = 5/9
+
+# Maps the lowercase source scale to its conversion into Celsius
+_CONV = {
+    "fahrenheit": lambda degrees: (degrees-32) * _F_SCALE,
+    "kelvin": lambda degrees: degrees - 273.15,
+}
+
+
 def convert_to_celsius(degrees, source="fahrenheit"):
-    if source.lower() == "fahrenheit":
-        return (degrees-32) * (5/9)
-    elif source.lower() == "kelvin":
-        return degrees - 273.15
+    # Most calls pass a lowercase string (like the default), which is
+    # found without creating a lowercase copy first
+    convert = _CONV.get(source) or _CONV.get(source.lower())
+    if convert:
+        return convert(degrees)
     else:
         return f"Don't know how to convert from {source}"
 
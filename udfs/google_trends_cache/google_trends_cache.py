@@ -1,11 +1,29 @@
 from functools import lru_cache
 
 import pandas as pd
+import requests
 from pytrends.request import TrendReq
 import matplotlib.pyplot as plt
 import xlwings as xw
 
 
+# Google's "mid" of common programming languages and their
+# human-readable equivalent
+_MID_MAP = {"/m/05z1_": "Python", "/m/02p97": "JavaScript",
+            "/m/0jgqg": "C++", "/m/07sbkfb": "Java", "/m/060kv": "PHP"}
+
+# The Google Trends client is created on first use and then reused by
+# all calls so that only the first call has to connect to Google
+_TREND = None
+
+
+def _get_trend(new=False):
+    global _TREND
+    if _TREND is None or new:
+        _TREND = TrendReq(timeout=10)
+    return _TREND
+
+
 @lru_cache()
 @xw.func(call_in_wizard=False)
 @xw.arg("mids", xw.Range, doc="Machine IDs: A range of max 5 cells")
@@ -25,15 +43,20 @@ def get_interest_over_time(mids, start_date, end_date):
     end_date = end_date.date().isoformat()
 
     # Make the Google Trends request and return the DataFrame
-    trend = TrendReq(timeout=10)
-    trend.build_payload(kw_list=mids,
-                        timeframe=f"{start_date} {end_date}")
-    df = trend.interest_over_time()
+    timeframe = f"{start_date} {end_date}"
+    try:
+        trend = _get_trend()
+        trend.build_payload(kw_list=mids, timeframe=timeframe)
+        df = trend.interest_over_time()
+    except requests.exceptions.RequestException:
+        # The connection of the reused client may have gone stale:
+        # try once more with a new client
+        trend = _get_trend(new=True)
+        trend.build_payload(kw_list=mids, timeframe=timeframe)
+        df = trend.interest_over_time()
 
     # Replace Google's "mid" with a human-readable word
-    mids = {"/m/05z1_": "Python", "/m/02p97": "JavaScript",
-            "/m/0jgqg": "C++", "/m/07sbkfb": "Java", "/m/060kv": "PHP"}
-    df = df.rename(columns=mids)
+    df = df.rename(columns=_MID_MAP)
 
     # Drop the isPartial column
     return df.drop(columns="isPartial")
@@ -2,10 +2,17 @@ import numpy as np
 import xlwings as xw
 
 
+# Creating the generator once is cheaper than on every call
+_RNG = np.random.default_rng()
+
+
 @xw.func
 @xw.ret("raw")
 def randn(i=1000, j=1000):
     """Returns an array with dimensions (i, j) with normally distributed
-    pseudorandom numbers provided by NumPy's random.randn
+    pseudorandom numbers provided by NumPy's random Generator.
+    The values stay float64: Excel stores every number as double and the
+    COM interface can't convert NumPy's float32.
     """
-    return np.random.randn(i, j)
+    # Excel passes numbers from cells as floats, but size requires integers
+    return _RNG.standard_normal(size=(int(i), int(j)), dtype=np.float64)
@@ -3,7 +3,11 @@ import xlwings as xw
 
 
 @xw.func
+@xw.arg("users", np.array, ndim=2)
+@xw.arg("price", np.array)
 def revenue(base_fee, users, price):
+    # With arrays, NumPy computes the whole range in one go via
+    # broadcasting, single cells are simply arrays with one element
     return base_fee + users * price
 
 
@@ -11,4 +15,5 @@ def revenue(base_fee, users, price):
 @xw.arg("users", np.array, ndim=2)
 @xw.arg("price", np.array)
 def revenue2(base_fee, users, price):
-    return base_fee + users * price
+    # Same as revenue, kept as the array formula in revenues.xlsm uses it
+    return revenue(base_fee, users, price)